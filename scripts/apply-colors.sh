@@ -142,13 +142,13 @@ mkdir -p "$STATE_DIR/generated"
 if [[ ! -d "$VENV_DIR" ]]; then
     echo "Creating virtual environment..."
     python3 -m venv "$VENV_DIR"
-    "$VENV_DIR/bin/pip" install materialyoucolor Pillow
+    "$VENV_DIR/bin/pip" install materialyoucolor Pillow numpy
 fi
 
 # Check if dependencies are installed in venv
-if ! "$VENV_DIR/bin/python3" -c "from materialyoucolor.quantize import QuantizeCelebi; from PIL import Image" 2>/dev/null; then
+if ! "$VENV_DIR/bin/python3" -c "import numpy; from materialyoucolor.quantize import QuantizeCelebi; from PIL import Image" 2>/dev/null; then
     echo "Installing Python dependencies in venv..."
-    "$VENV_DIR/bin/pip" install materialyoucolor Pillow || {
+    "$VENV_DIR/bin/pip" install materialyoucolor Pillow numpy || {
         echo "ERROR: Failed to install dependencies." >&2
         exit 1
     }
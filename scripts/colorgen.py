@@ -12,82 +12,145 @@ USAGE:
     python colorgen.py --color "#ff5500" --mode dark --output colors.json
 
 DEPENDENCIES:
-    pip install materialyoucolor Pillow
+    pip install materialyoucolor Pillow numpy
+    pip install orjson  (optional, faster JSON output)
 
 ============================================================================
 """
 
-import argparse
-import json
+import functools
+import hashlib
+import os
 import sys
+import time
 from pathlib import Path
+from types import SimpleNamespace
 
 # Lazy-loaded modules (improves startup time)
+_np = None
 _PIL_Image = None
 _QuantizeCelebi = None
 _Score = None
+_ScoreOptions = None
 _Hct = None
 _MaterialDynamicColors = None
 
+# (name, bound DynamicColor.get_hct) pairs from MaterialDynamicColors,
+# filled by _load_material()
+_DYNAMIC_ROLES = None
 
-def _load_deps():
-    """Lazy load dependencies only when needed."""
-    global _PIL_Image, _QuantizeCelebi, _Score, _Hct, _MaterialDynamicColors
+
+def _missing_deps():
+    print("ERROR: Missing dependencies. Install with:\n"
+          "  pip install materialyoucolor Pillow numpy", file=sys.stderr)
+    sys.exit(1)
+
+
+def _load_numpy():
+    """Lazy load numpy, only needed for image extraction."""
+    global _np
+    
+    if _np is not None:
+        return True
+    
+    try:
+        import numpy
+        
+        _np = numpy
+        return True
+    except ImportError:
+        _missing_deps()
+
+
+def _load_pil():
+    """Lazy load Pillow, only needed for image extraction."""
+    global _PIL_Image
     
     if _PIL_Image is not None:
         return True
     
     try:
         from PIL import Image
+        
+        _PIL_Image = Image
+        return True
+    except ImportError:
+        _missing_deps()
+
+
+def _load_material():
+    """Lazy load materialyoucolor, needed on every path."""
+    global _QuantizeCelebi, _Score, _ScoreOptions, _Hct, _MaterialDynamicColors
+    global _DYNAMIC_ROLES
+    
+    if _MaterialDynamicColors is not None:
+        return True
+    
+    try:
         from materialyoucolor.quantize import QuantizeCelebi
-        from materialyoucolor.score.score import Score
+        from materialyoucolor.score.score import Score, ScoreOptions
         from materialyoucolor.hct import Hct
+        from materialyoucolor.hct.hct_solver import HctSolver
         from materialyoucolor.dynamiccolor.material_dynamic_colors import MaterialDynamicColors
         
-        _PIL_Image = Image
         _QuantizeCelebi = QuantizeCelebi
         _Score = Score
+        _ScoreOptions = ScoreOptions
         _Hct = Hct
         _MaterialDynamicColors = MaterialDynamicColors
+        
+        # Resolving a scheme's roles solves the same (hue, chroma, tone)
+        # over and over (~1100 calls, ~160 distinct). The solver is pure,
+        # so memoize it. NOTE: this patches materialyoucolor's class for the
+        # whole process, and only helps because Hct looks the staticmethod
+        # up on the class each call; skip it if the library's layout changes.
+        if isinstance(HctSolver.__dict__.get('solve_to_int'), staticmethod):
+            HctSolver.solve_to_int = staticmethod(
+                functools.lru_cache(maxsize=None)(HctSolver.solve_to_int)
+            )
+        
+        # Scan the role list once instead of on every scheme generation,
+        # binding get_hct up front so the loop does no attribute lookups
+        _DYNAMIC_ROLES = tuple(
+            (name, getattr(MaterialDynamicColors, name).get_hct)
+            for name in dir(MaterialDynamicColors)
+            if not name.startswith('_')
+            and hasattr(getattr(MaterialDynamicColors, name, None), 'get_hct')
+        )
         return True
     except ImportError:
-        print("ERROR: Missing dependencies. Install with:", file=sys.stderr)
-        print("  pip install materialyoucolor Pillow", file=sys.stderr)
-        sys.exit(1)
+        _missing_deps()
 
 
 # ============================================================================
 #                          HELPER FUNCTIONS
 # ============================================================================
 
+# Two-digit uppercase hex for every channel value (avoids str.format per color)
+_HEX = [f"{i:02X}" for i in range(256)]
+
+
 def argb_to_hex(argb):
     """Convert ARGB integer to hex string."""
-    return "#{:02X}{:02X}{:02X}".format(
-        (argb >> 16) & 0xFF,
-        (argb >> 8) & 0xFF,
-        argb & 0xFF
-    )
+    return f"#{_HEX[(argb >> 16) & 0xFF]}{_HEX[(argb >> 8) & 0xFF]}{_HEX[argb & 0xFF]}"
 
 
 def hex_to_argb(hex_code):
     """Convert hex string to ARGB integer."""
-    hex_code = hex_code.lstrip('#')
-    r = int(hex_code[0:2], 16)
-    g = int(hex_code[2:4], 16)
-    b = int(hex_code[4:6], 16)
+    r, g, b = bytes.fromhex(hex_code.lstrip('#')[:6])
     return (0xFF << 24) | (r << 16) | (g << 8) | b
 
 
 def blend_colors(hex1, hex2, amount):
     """Blend two hex colors. amount: 0.0 = hex1, 1.0 = hex2."""
-    r1, g1, b1 = int(hex1[1:3], 16), int(hex1[3:5], 16), int(hex1[5:7], 16)
-    r2, g2, b2 = int(hex2[1:3], 16), int(hex2[3:5], 16), int(hex2[5:7], 16)
+    r1, g1, b1 = bytes.fromhex(hex1.lstrip('#')[:6])
+    r2, g2, b2 = bytes.fromhex(hex2.lstrip('#')[:6])
     
     r = int(r1 + (r2 - r1) * amount)
     g = int(g1 + (g2 - g1) * amount)
     b = int(b1 + (b2 - b1) * amount)
     
-    return "#{:02X}{:02X}{:02X}".format(r, g, b)
+    return f"#{_HEX[r]}{_HEX[g]}{_HEX[b]}"
 
 
 # ============================================================================
@@ -95,82 +158,118 @@ def blend_colors(hex1, hex2, amount):
 # ============================================================================
 
 def calculate_saturation_sampled(pixels, sample_size=1000):
-    """Calculate average saturation using sampling for large images."""
-    if not pixels:
+    """Calculate average saturation using sampling for large images.
+    
+    Pure Python on purpose: it only sees the small probe image, and
+    importing numpy for that would cost far more than the loop.
+    
+    Args:
+        pixels: raw RGB bytes (3 bytes per pixel)
+    """
+    total = len(pixels) // 3
+    if total == 0:
         return 0
     
-    total = len(pixels)
-    step = max(1, total // sample_size)
+    stride = max(1, total // sample_size) * 3
     
     total_sat = 0
     count = 0
     
-    for i in range(0, total, step):
-        r, g, b = pixels[i][0], pixels[i][1], pixels[i][2]
+    for r, g, b in zip(pixels[0::stride], pixels[1::stride], pixels[2::stride]):
         max_c = max(r, g, b)
-        min_c = min(r, g, b)
-        
         if max_c > 0:
-            total_sat += (max_c - min_c) / max_c
+            total_sat += (max_c - min(r, g, b)) / max_c
         count += 1
     
-    return (total_sat / count * 100) if count > 0 else 0
+    return total_sat / count * 100
+
+
+def flatten_alpha(image):
+    """Composite an RGBA image onto white (other modes pass through).
+    
+    Fully opaque images just drop the alpha channel.
+    """
+    if image.mode != 'RGBA':
+        return image
+    
+    if image.getextrema()[3][0] == 255:
+        return image.convert('RGB')
+    
+    bg = _PIL_Image.new('RGB', image.size, (255, 255, 255))
+    bg.paste(image, mask=image.split()[3])
+    return bg
+
+
+def to_pixels(image):
+    """Get RGB pixel data as an (N, 3) array straight from the raw buffer."""
+    return _np.frombuffer(image.tobytes(), dtype=_np.uint8).reshape(-1, 3)
+
+
+# Image modes that Image.reduce() box-averages correctly
+_REDUCIBLE_MODES = ('L', 'LA', 'RGB', 'RGBA', 'RGBX', 'CMYK', 'YCbCr', 'I', 'F')
 
 
 def extract_color_from_image(image_path, size=64):
     """Extract dominant color from image using Material You quantization.
     
     Returns:
-        tuple: (argb_color, is_grayscale)
+        tuple: (argb_color, is_grayscale, hct); hct is None for monochrome
     """
-    _load_deps()
+    _load_pil()
+    _load_material()
+    
+    # --size 0 or below means "as small as possible", as it always has
+    size = max(1, size)
     
     image = _PIL_Image.open(image_path)
     
+    # Let libjpeg decode at a reduced scale (no-op for other formats)
+    image.draft('RGB', (size * 2, size * 2))
+    
     # Handle animated images - just use first frame
     if hasattr(image, 'n_frames') and image.n_frames > 1:
         image.seek(0)
     
-    # Convert to RGB
-    if image.mode != 'RGB':
-        if image.mode == 'RGBA':
-            bg = _PIL_Image.new('RGB', image.size, (255, 255, 255))
-            bg.paste(image, mask=image.split()[3])
-            image = bg
-        else:
-            image = image.convert('RGB')
-    
-    # Calculate optimal size (maintain aspect ratio)
-    w, h = image.size
-    if w > size or h > size:
-        scale = size / max(w, h)
-        image = image.resize(
-            (max(1, int(w * scale)), max(1, int(h * scale))),
-            _PIL_Image.Resampling.LANCZOS
-        )
+    # Box-average down by a power of two first, so mode conversion below
+    # never runs on a full-size wallpaper. Only modes whose channels are real
+    # values qualify: reduce() would average palette indices in 'PA'.
+    factor = max(1, min(image.size) // (size * 4))
+    factor = 1 << (factor.bit_length() - 1)
+    if factor > 1 and image.mode in _REDUCIBLE_MODES:
+        image = image.reduce(factor)
     
-    # Get pixel data (use new API if available)
-    if hasattr(image, 'get_flattened_data'):
-        pixels = list(image.get_flattened_data())
-        # Reformat from flat to tuples if needed
-        if pixels and not isinstance(pixels[0], tuple):
-            pixels = [(pixels[i], pixels[i+1], pixels[i+2]) for i in range(0, len(pixels), 3)]
-    else:
-        pixels = list(image.getdata())
+    # Convert to RGB (RGBA is kept until after the downscale)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGB')
     
-    # Check saturation (sample-based for speed)
-    avg_sat = calculate_saturation_sampled(pixels)
+    # Check saturation on a 32x32 box-averaged probe, so grayscale wallpapers
+    # bail out before the thumbnail or quantization. BOX averages every
+    # pixel, so stripes and fine detail aren't aliased away like NEAREST.
+    probe = flatten_alpha(image.resize((32, 32), _PIL_Image.Resampling.BOX))
+    avg_sat = calculate_saturation_sampled(probe.tobytes())
     
     if avg_sat < 15:
         print(f"Low saturation ({avg_sat:.1f}%), using monochrome", file=sys.stderr)
-        return (0xFF << 24) | (128 << 16) | (128 << 8) | 128, True
+        return (0xFF << 24) | (128 << 16) | (128 << 8) | 128, True, None
+    
+    # Downscale in place (maintains aspect ratio, never upscales).
+    # Quantization doesn't benefit from LANCZOS, BILINEAR is much cheaper.
+    image.thumbnail((size, size), _PIL_Image.Resampling.BILINEAR)
+    
+    # Past the probe, so grayscale wallpapers never import numpy
+    _load_numpy()
+    
+    # Composite after the downscale so it only touches the small image
+    pixels = to_pixels(flatten_alpha(image))
     
-    # Quantize and score
-    colors = _QuantizeCelebi(pixels, 128)
-    scored = _Score.score(colors)
+    # Quantize and score. QuantizeCelebi builds its own histogram and only
+    # takes RGB sequences, so pixels can't be pre-weighted or deduplicated
+    colors = _QuantizeCelebi(pixels.tolist(), 128)
+    # Only the top color is used; asking for one skips Score's hue-spread retries
+    scored = _Score.score(colors, _ScoreOptions(desired=1))
     
     if not scored:
-        return None, False
+        return None, False, None
     
     # Verify chroma
     best = scored[0]
@@ -178,38 +277,42 @@ def extract_color_from_image(image_path, size=64):
     
     if hct.chroma < 10:
         print(f"Low chroma ({hct.chroma:.1f}), using monochrome", file=sys.stderr)
-        return (0xFF << 24) | (128 << 16) | (128 << 8) | 128, True
+        return (0xFF << 24) | (128 << 16) | (128 << 8) | 128, True, None
     
-    return best, False
+    return best, False, hct
 
 
 # Scheme class cache
 _scheme_cache = {}
 
+# Each loader imports only its own scheme module
+_SCHEME_LOADERS = {
+    'tonal-spot': lambda: __import__('materialyoucolor.scheme.scheme_tonal_spot',
+                                     fromlist=['SchemeTonalSpot']).SchemeTonalSpot,
+    'content': lambda: __import__('materialyoucolor.scheme.scheme_content',
+                                  fromlist=['SchemeContent']).SchemeContent,
+    'expressive': lambda: __import__('materialyoucolor.scheme.scheme_expressive',
+                                     fromlist=['SchemeExpressive']).SchemeExpressive,
+    'fidelity': lambda: __import__('materialyoucolor.scheme.scheme_fidelity',
+                                   fromlist=['SchemeFidelity']).SchemeFidelity,
+    'monochrome': lambda: __import__('materialyoucolor.scheme.scheme_monochrome',
+                                     fromlist=['SchemeMonochrome']).SchemeMonochrome,
+    'neutral': lambda: __import__('materialyoucolor.scheme.scheme_neutral',
+                                  fromlist=['SchemeNeutral']).SchemeNeutral,
+    'vibrant': lambda: __import__('materialyoucolor.scheme.scheme_vibrant',
+                                  fromlist=['SchemeVibrant']).SchemeVibrant,
+    'fruit-salad': lambda: __import__('materialyoucolor.scheme.scheme_fruit_salad',
+                                      fromlist=['SchemeFruitSalad']).SchemeFruitSalad,
+    'rainbow': lambda: __import__('materialyoucolor.scheme.scheme_rainbow',
+                                  fromlist=['SchemeRainbow']).SchemeRainbow,
+}
+
 def get_scheme_class(scheme_name):
     """Get scheme class with caching."""
-    if scheme_name in _scheme_cache:
-        return _scheme_cache[scheme_name]
-    
-    schemes = {
-        'tonal-spot': ('materialyoucolor.scheme.scheme_tonal_spot', 'SchemeTonalSpot'),
-        'content': ('materialyoucolor.scheme.scheme_content', 'SchemeContent'),
-        'expressive': ('materialyoucolor.scheme.scheme_expressive', 'SchemeExpressive'),
-        'fidelity': ('materialyoucolor.scheme.scheme_fidelity', 'SchemeFidelity'),
-        'monochrome': ('materialyoucolor.scheme.scheme_monochrome', 'SchemeMonochrome'),
-        'neutral': ('materialyoucolor.scheme.scheme_neutral', 'SchemeNeutral'),
-        'vibrant': ('materialyoucolor.scheme.scheme_vibrant', 'SchemeVibrant'),
-        'fruit-salad': ('materialyoucolor.scheme.scheme_fruit_salad', 'SchemeFruitSalad'),
-        'rainbow': ('materialyoucolor.scheme.scheme_rainbow', 'SchemeRainbow'),
-    }
-    
-    module_name, class_name = schemes.get(scheme_name, schemes['tonal-spot'])
-    
-    import importlib
-    module = importlib.import_module(module_name)
-    cls = getattr(module, class_name)
-    _scheme_cache[scheme_name] = cls
-    return cls
+    if scheme_name not in _scheme_cache:
+        loader = _SCHEME_LOADERS.get(scheme_name, _SCHEME_LOADERS['tonal-spot'])
+        _scheme_cache[scheme_name] = loader()
+    return _scheme_cache[scheme_name]
 
 
 # ============================================================================
@@ -218,7 +321,7 @@ def get_scheme_class(scheme_name):
 
 def generate_material_colors(argb, is_dark_mode, scheme_name='tonal-spot'):
     """Generate Material Design 3 color scheme from seed color."""
-    _load_deps()
+    _load_material()
     
     hct = _Hct.from_int(argb)
     SchemeClass = get_scheme_class(scheme_name)
@@ -226,19 +329,10 @@ def generate_material_colors(argb, is_dark_mode, scheme_name='tonal-spot'):
     
     colors = {}
     
-    for attr_name in dir(_MaterialDynamicColors):
-        if attr_name.startswith('_'):
-            continue
-        
-        attr = getattr(_MaterialDynamicColors, attr_name, None)
-        if attr is None or not hasattr(attr, 'get_hct'):
-            continue
-        
+    for name, get_hct in _DYNAMIC_ROLES:
         try:
-            rgba = attr.get_hct(scheme).to_rgba()
-            colors[attr_name] = "#{:02X}{:02X}{:02X}".format(
-                int(rgba[0]), int(rgba[1]), int(rgba[2])
-            )
+            rgba = get_hct(scheme).to_rgba()
+            colors[name] = f"#{_HEX[int(rgba[0])]}{_HEX[int(rgba[1])]}{_HEX[int(rgba[2])]}"
         except Exception:
             pass
     
@@ -291,11 +385,159 @@ def generate_shell_colors(material_colors, is_dark_mode):
     }
 
 
+# ============================================================================
+#                              RESULT CACHE
+# ============================================================================
+
+_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or '~/.cache').expanduser() / 'colorgen'
+_CACHE_MAX_ENTRIES = 32
+
+
+def _materialyoucolor_stamp():
+    """Identify the installed materialyoucolor without importing it.
+    
+    Its location and mtime change with the venv and on every upgrade.
+    importlib.metadata would give the version, but costs ~50ms to import.
+    """
+    from importlib.util import find_spec
+    spec = find_spec('materialyoucolor')
+    if spec is None or not spec.origin:
+        return ''
+    try:
+        return f"{spec.origin}@{os.stat(spec.origin).st_mtime_ns}"
+    except OSError:
+        return spec.origin
+
+
+def get_cache_file(args, path=None):
+    """Get cache file for a run.
+    
+    Keyed on the seed (the image's path, mtime and size, or the hex color)
+    plus every option that affects the output. This script's own mtime and
+    the installed materialyoucolor are included so edits and upgrades
+    invalidate it.
+    """
+    if path is not None:
+        st = path.stat()
+        source = f"{path.resolve()}:{st.st_mtime_ns}:{st.st_size}:{args.size}"
+    else:
+        source = args.color.lstrip('#').upper()
+    
+    script_st = Path(__file__).stat()
+    key = (f"{source}:{script_st.st_mtime_ns}:{_materialyoucolor_stamp()}:"
+           f"{args.mode}:{args.scheme}:{args.pretty}")
+    return _CACHE_DIR / f"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.json"
+
+
+def save_cache_file(cache_file, text):
+    """Store output text in the cache, keeping only the newest entries.
+    
+    Best-effort: any filesystem error just leaves the cache as it was.
+    """
+    # Per-process temp name: apply-colors.sh and the QML --color call can
+    # write the same key at once
+    tmp = cache_file.with_name(f"{cache_file.stem}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(text)
+        tmp.replace(cache_file)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        return
+    
+    try:
+        entries = sorted(cache_file.parent.glob('*.json'),
+                         key=lambda p: p.stat().st_mtime_ns, reverse=True)
+        for old in entries[_CACHE_MAX_ENTRIES:]:
+            old.unlink(missing_ok=True)
+        
+        # Temp files left behind by a crashed writer (give live ones a minute)
+        cutoff = time.time() - 60
+        for stale in cache_file.parent.glob('*.tmp'):
+            if stale.stat().st_mtime < cutoff:
+                stale.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def dump_json(output, pretty=False):
+    """Serialize output to JSON text, compact unless pretty is set.
+    
+    Uses orjson when installed, otherwise the standard library.
+    """
+    try:
+        import orjson
+        return orjson.dumps(output, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+    except ImportError:
+        import json
+        if pretty:
+            return json.dumps(output, indent=2)
+        return json.dumps(output, separators=(',', ':'))
+
+
+def write_output(text, output):
+    """Write JSON text to the output file, or stdout if none given."""
+    if output:
+        out_path = Path(output).expanduser()
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(text)
+    else:
+        print(text)
+
+
 # ============================================================================
 #                              MAIN
 # ============================================================================
 
-def main():
+MODES = ('dark', 'light')
+SCHEMES = ('tonal-spot', 'content', 'expressive', 'fidelity',
+           'monochrome', 'neutral', 'vibrant', 'fruit-salad', 'rainbow')
+
+
+def _fast_parse(argv):
+    """Parse the common argument shapes without importing argparse.
+    
+    Returns:
+        SimpleNamespace, or None if anything is unusual (unknown flag,
+        --help, bad value, ...) so argparse can handle it and report errors.
+    """
+    args = SimpleNamespace(path=None, color=None, output=None, mode='dark',
+                           scheme='tonal-spot', size=64, pretty=False, debug=False)
+    options = {'--path': 'path', '--color': 'color', '--output': 'output',
+               '-o': 'output', '--mode': 'mode', '--scheme': 'scheme', '--size': 'size'}
+    
+    i = 0
+    while i < len(argv):
+        flag = argv[i]
+        if flag in ('--pretty', '--debug'):
+            setattr(args, flag[2:], True)
+            i += 1
+            continue
+        if flag not in options or i + 1 >= len(argv) or argv[i + 1].startswith('-'):
+            return None
+        setattr(args, options[flag], argv[i + 1])
+        i += 2
+    
+    if (args.path is None) == (args.color is None):
+        return None
+    if args.mode not in MODES or args.scheme not in SCHEMES:
+        return None
+    if isinstance(args.size, str):
+        if not args.size.isdecimal():
+            return None
+        args.size = int(args.size)
+    
+    return args
+
+
+def parse_args(argv):
+    """Parse command line arguments, falling back to argparse if needed."""
+    args = _fast_parse(argv)
+    if args is not None:
+        return args
+    
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='Generate Material You colors from wallpaper or color'
     )
@@ -305,29 +547,48 @@ def main():
     input_group.add_argument('--color', type=str, help='Hex color code')
     
     parser.add_argument('--output', '-o', type=str, help='Output JSON file')
-    parser.add_argument('--mode', choices=['dark', 'light'], default='dark')
-    parser.add_argument('--scheme', default='tonal-spot',
-                        choices=['tonal-spot', 'content', 'expressive', 'fidelity',
-                                 'monochrome', 'neutral', 'vibrant', 'fruit-salad', 'rainbow'])
+    parser.add_argument('--mode', choices=MODES, default='dark')
+    parser.add_argument('--scheme', default='tonal-spot', choices=SCHEMES)
     parser.add_argument('--size', type=int, default=64, help='Resize for extraction')
+    parser.add_argument('--pretty', action='store_true', help='Indent JSON output')
     parser.add_argument('--debug', action='store_true')
     
-    args = parser.parse_args()
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv[1:])
     is_dark = args.mode == 'dark'
     use_mono = False
+    seed_hct = None
+    cache_file = None
+    path = None
     
     if args.path:
         path = Path(args.path).expanduser()
         if not path.exists():
             print(f"ERROR: File not found: {path}", file=sys.stderr)
             sys.exit(1)
-        
+    
+    # Same seed and options as a previous run: reuse its output before
+    # any heavy dependency is imported. --debug always recomputes.
+    if not args.debug:
+        cache_file = get_cache_file(args, path)
+        if cache_file.is_file():
+            write_output(cache_file.read_text(), args.output)
+            try:
+                os.utime(cache_file)  # Mark as recently used for pruning
+            except OSError:
+                pass
+            return
+    
+    if path:
         result = extract_color_from_image(path, args.size)
         if not result or result[0] is None:
             print("ERROR: Could not extract color", file=sys.stderr)
             sys.exit(1)
         
-        argb, use_mono = result
+        argb, use_mono, seed_hct = result
         
         if args.debug:
             print(f"Extracted: {argb_to_hex(argb)}", file=sys.stderr)
@@ -347,17 +608,15 @@ def main():
         'shell': shell
     }
     
-    if args.output:
-        out_path = Path(args.output).expanduser()
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(out_path, 'w') as f:
-            json.dump(output, f, indent=2)
-    else:
-        print(json.dumps(output, indent=2))
+    text = dump_json(output, args.pretty)
+    write_output(text, args.output)
+    
+    if cache_file:
+        save_cache_file(cache_file, text)
     
     if args.debug:
-        _load_deps()
-        hct = _Hct.from_int(argb)
+        # Reuse the HCT from extraction; only monochrome/--color need one
+        hct = seed_hct or _Hct.from_int(argb)
         print(f"HCT: H={hct.hue:.1f} C={hct.chroma:.1f} T={hct.tone:.1f}", file=sys.stderr)
 
 